@@ -0,0 +1,55 @@
+"""
+CPU-bound pipeline stages for the streaming (async) view.
+
+Each function runs inside a worker of the bounded process pool, so it only takes
+plain arguments (file path, column name, task type) and returns plain values.
+Results are cached in the upload's DatasetProfile sidecar, so the raw file is only
+parsed when a stage hasn't run before for this (target, task) pair.
+"""
+import pandas as pd
+
+from src.feature_extractor import FeatureExtractor
+from src.baseline_models import BaselineEstimator
+from src.ml_models import MLEstimator
+from src.dataset_profile import DatasetProfile
+
+
+def read_dataset(file_path):
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path)
+    elif file_path.endswith('.xlsx'):
+        return pd.read_excel(file_path)
+    raise ValueError('Unsupported file format')
+
+
+def ingest(file_path):
+    """
+    Builds (or finds) the profile sidecar for an upload. Returns (columns, profile_path).
+    """
+    profile = DatasetProfile.for_upload(file_path, lambda: read_dataset(file_path))
+    return profile.columns, profile.path
+
+
+def extract_features(file_path, profile_path, target_col, task_type):
+    profile = DatasetProfile.load(profile_path)
+    return profile.cached(('meta_features', target_col, task_type), lambda: FeatureExtractor(
+        read_dataset(file_path), target_col, task_type, profile).extract_features())
+
+
+def baseline_score(file_path, profile_path, target_col, task_type):
+    profile = DatasetProfile.load(profile_path)
+    return profile.cached(('baseline', target_col, task_type), lambda: BaselineEstimator(
+        read_dataset(file_path), target_col, task_type, profile).get_baseline_performance())
+
+
+def score_model(file_path, profile_path, target_col, task_type, model_name, search_budget=None, executor=None):
+    # Returns (mean, std, best_params); best_params is empty unless the budgeted search ran
+    profile = DatasetProfile.load(profile_path)
+
+    def compute():
+        ml_est = MLEstimator(read_dataset(file_path), target_col, task_type, executor=executor,
+                             search_budget=search_budget, profile=profile)
+        score, std = ml_est.score_model(model_name)
+        return [score, std, ml_est.best_params]
+
+    return tuple(profile.cached(('model', target_col, task_type, model_name, search_budget), compute))
@@ -1,3 +1,191 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import AsyncClient, SimpleTestCase, override_settings
+
+from analyzer import views
+from analyzer.views import _context_data
+from src.dataset_profile import DatasetProfile
+from src.executors import DistributedExecutor, InProcessExecutor
+from src.feature_extractor import FeatureExtractor
+from src.ml_models import MLEstimator
+from src.model_search import ModelSearch, search_space
+
+
+def make_frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'age': rng.integers(18, 70, n),
+        'balance': rng.normal(1000, 300, n),
+        'plan': rng.choice(['basic', 'plus', 'pro'], n),
+    })
+    df['label'] = ((df['balance'] > 1000) ^ (df['plan'] == 'pro')).astype(int)
+    return df
+
+
+class ExecutorTests(SimpleTestCase):
+    def test_distributed_matches_in_process(self):
+        df = make_frame()
+        expected = MLEstimator(df, 'label', 'classification', executor=InProcessExecutor()).estimate_performance()
+
+        with DistributedExecutor(address=('127.0.0.1', 0), local_workers=2) as executor:
+            result = MLEstimator(df, 'label', 'classification', executor=executor).estimate_performance()
+
+        self.assertEqual(result[2], expected[2])
+        self.assertAlmostEqual(result[0], expected[0])
+        self.assertAlmostEqual(result[1], expected[1])
+
+    def test_distributed_refuses_public_address_without_authkey(self):
+        with self.assertRaises(ValueError):
+            DistributedExecutor(address=('0.0.0.0', 0))
+
+
+class ModelSearchTests(SimpleTestCase):
+    def setUp(self):
+        self.df = make_frame()
+        self.ml_est = MLEstimator(self.df, 'label', 'classification')
+        self.X = self.df.drop(columns=['label'])
+        self.y = self.df['label']
+
+    def search(self, budget, **kwargs):
+        return ModelSearch(self.X, self.y, 'classification', self.ml_est.build_preprocessor(), budget, **kwargs)
+
+    def test_zero_budget_still_scores_every_family_baseline(self):
+        baselines = dict(self.ml_est._candidate_models())
+        search = self.search(0, baselines=baselines)
+        score, _, name, params = search.run()
+
+        scored = [c for c in search.candidates if c['rung'] >= 0]
+        # Only the baseline of each family fits in a zero budget
+        self.assertEqual([c['estimator'] for c in scored], list(baselines.values()))
+        self.assertGreater(score, 0.5)
+        self.assertIn(name, baselines)
+
+    def test_tiny_budget_never_below_fixed_model(self):
+        fixed = MLEstimator(self.df, 'label', 'classification')
+        searched = MLEstimator(self.df, 'label', 'classification', search_budget=0.01)
+        for name in fixed.model_names():
+            self.assertGreaterEqual(searched.score_model(name)[0], fixed.score_model(name)[0], msg=name)
+
+    def test_successive_halving_promotes_with_growing_resource(self):
+        search = self.search(600, families=['RandomForest'])
+        _, _, name, params = search.run()
+
+        self.assertEqual(name, 'RandomForest')
+        # 4 configs -> 2 -> 1, resource 20 -> 60 -> 180 trees
+        rungs = sorted(c['rung'] for c in search.candidates)
+        self.assertEqual(rungs, [0, 0, 1, 2])
+        self.assertIn(params['n_estimators'], (20, 60, 180))
+
+    def test_reports_families_without_a_scored_candidate(self):
+        baselines = dict(self.ml_est._candidate_models())
+        baselines['RandomForest'] = baselines['RandomForest'].set_params(n_estimators=-1)
+        search = self.search(0, baselines=baselines, families=['LogisticRegression', 'RandomForest'])
+        _, _, name, _ = search.run()
+
+        self.assertEqual(name, 'LogisticRegression')
+        self.assertEqual(search.failed_families, ['RandomForest'])
+
+    def test_rejects_invalid_budgets(self):
+        for budget in (-1, float('nan'), float('inf')):
+            with self.assertRaises(ValueError):
+                self.search(budget)
+            with self.assertRaises(ValueError):
+                _context_data({'search_budget': str(budget)})
+
+
+class DatasetProfileTests(SimpleTestCase):
+    def setUp(self):
+        self.df = make_frame()
+        self.df.loc[::7, 'balance'] = np.nan
+        self.df.loc[::11, 'plan'] = None
+        self.profile = DatasetProfile.build(self.df)
+
+    def test_feature_stats_match_dataframe(self):
+        expected = FeatureExtractor(self.df, 'label', 'classification').extract_features()
+        result = FeatureExtractor(self.df, 'label', 'classification', self.profile).extract_features()
+
+        for key in ('n_samples', 'n_features', 'missing_ratio', 'label_entropy', 'imbalance_ratio', 'feature_cardinality_avg'):
+            self.assertAlmostEqual(result[key], expected[key], msg=key)
+
+    def test_preprocessor_columns_match_dataframe(self):
+        def columns(profile):
+            preprocessor = MLEstimator(self.df, 'label', 'classification', profile=profile).build_preprocessor()
+            return [(name, list(cols)) for name, _, cols in preprocessor.transformers]
+
+        self.assertEqual(columns(self.profile), columns(None))
+
+    def test_only_cached_results_that_should_be_kept(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.profile.path = os.path.join(root, 'data.profile.json')
+            calls = []
+
+            def compute():
+                calls.append(1)
+                return [0.0, 0.0, "None", {}]
+
+            for _ in range(2):
+                self.profile.cached(('ml', 'label'), compute, should_cache=lambda r: r[2] != "None")
+            self.assertEqual(len(calls), 2)
+
+            self.profile.cached(('baseline', 'label'), lambda: 0.5)
+            self.assertEqual(DatasetProfile.load(self.profile.path).data['results'], {'baseline|label': 0.5})
+
+
+    def test_fresh_result_matches_cached_one(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.profile.path = os.path.join(root, 'data.profile.json')
+            key = ('model', 'label', 'NeuralNetwork (MLP)')
+            fresh = self.profile.cached(key, lambda: [np.float64(0.9), 0.01, {'hidden_layer_sizes': (64, 32)}])
+
+            self.assertEqual(fresh, DatasetProfile.load(self.profile.path).cached(key, None))
+            self.assertEqual(fresh[2], {'hidden_layer_sizes': [64, 32]})
+
+class StreamingViewTests(SimpleTestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.csv_path = os.path.join(media_root, 'upload.csv')
+        make_frame().to_csv(self.csv_path, index=False)
+        self.client = AsyncClient()
+
+    @classmethod
+    def tearDownClass(cls):
+        if views._pool is not None:
+            views._pool.shutdown()
+            views._pool = None
+        super().tearDownClass()
+
+    async def post(self, **data):
+        with open(self.csv_path, 'rb') as f:
+            return await self.client.post('/analyze/', {'dataset': f, 'task_type': 'classification', **data})
+
+    async def test_rejects_missing_or_unknown_target(self):
+        for data in ({}, {'target_col': 'nope'}):
+            response = await self.post(**data)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('not found', response.json()['error'])
+
+    async def test_streams_stages_in_order_once(self):
+        response = await self.post(target_col='label')
+        self.assertEqual(response.status_code, 200)
+        job = response.json()
+        self.assertEqual(job['events_url'], f"/analyze/{job['job_id']}/events/")
+
+        response = await self.client.get(job['events_url'])
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        events = [line.split(': ', 1)[1] for line in body.splitlines() if line.startswith('event: ')]
+        models = [json.loads(line.split(': ', 1)[1])['name'] for line in body.splitlines()
+                  if line.startswith('data: ') and '"name"' in line]
+
+        names = MLEstimator(None, 'label', 'classification').model_names()
+        self.assertEqual(events, ['meta_features', 'baseline', *['model'] * len(names), 'result'])
+        self.assertEqual(sorted(models), sorted(names))
+
+        # Jobs are one-shot
+        response = await self.client.get(job['events_url'])
+        self.assertEqual(response.status_code, 404)
@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('analyze/', views.analyze, name='analyze'),
+    path('analyze/<str:job_id>/events/', views.analyze_events, name='analyze_events'),
 ]
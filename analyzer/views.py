@@ -1,9 +1,21 @@
+from django.conf import settings
 from django.shortcuts import render
 from django.core.files.storage import FileSystemStorage
-import pandas as pd
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from asgiref.sync import sync_to_async
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
 import json
+import math
 import os
 import sys
+import time
+import uuid
 
 # Ensure src is in path if needed, though being at root it should be fine if running from root
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
@@ -15,6 +27,83 @@ from src.cost_model import CostModel
 from src.risk_engine import RiskEngine
 from src.decision_engine import DecisionEngine
 from src.explainability import ExplainabilityReport
+from src.executors import get_executor
+from src.dataset_profile import DatasetProfile
+from . import pipeline
+
+_executor = None
+
+def _get_executor():
+    # Built lazily and shared across requests; the distributed backend owns a worker pool
+    global _executor
+    if _executor is None:
+        config = getattr(settings, 'ANALYSIS_EXECUTOR', {})
+        _executor = get_executor(config.get('BACKEND', 'inprocess'), **config.get('OPTIONS', {}))
+    return _executor
+
+def _context_data(post):
+    return {
+        'task_type': post.get('task_type', 'classification'),
+        'decision_criticality': post.get('criticality', 'medium'),
+        'rule_dev_time_hours': int(post.get('rule_dev_hours', 20)),
+        'ml_dev_time_hours': int(post.get('ml_dev_hours', 100)),
+        'training_cost_est': float(post.get('training_cost', 500)),
+        'inference_cost_monthly': float(post.get('inference_cost', 50)),
+        'maintenance_cost_monthly': float(post.get('maint_cost', 100)),
+        'hourly_rate': float(post.get('hourly_rate', 100)),
+        'search_budget': _search_budget(post.get('search_budget')),
+    }
+
+def _search_budget(value):
+    budget = float(value or 0)
+    if not math.isfinite(budget) or budget < 0:
+        raise ValueError(f"Search budget must be a finite number of seconds >= 0, got {value}")
+    return budget
+
+def _build_results(stats, base_score, ml_score, ml_std, best_model_name, context_data, best_params=None, profile=None):
+    """
+    Runs the cheap tail of the pipeline (cost, risk, decision, report) and returns the results.html context.
+    """
+    # D. Cost Model
+    cost_model = CostModel(context_data)
+    cost_res = cost_model.compute_roi_score() # (ratio, rule_cost, ml_cost)
+
+    # E. Risk Engine
+    risk_eng = RiskEngine(stats, context_data, ml_std, profile)
+    risk_score = risk_eng.calculate_risk()
+
+    # F. Decision Engine
+    decider = DecisionEngine(ml_score, base_score, cost_res[0], risk_score)
+    recommendation, reasons = decider.make_decision()
+
+    # G. Explanation, passing best_model_name
+    explainer = ExplainabilityReport(stats, base_score, ml_score, ml_std, cost_res, risk_score, recommendation, reasons, best_model_name, best_params)
+    report_text = explainer.generate_report()
+
+    return {
+        'report': report_text,
+        'recommendation': recommendation,
+        'stats': stats,
+        'base_score': base_score,
+        'ml_score': ml_score,
+        'cost_res': cost_res,
+        'risk_score': risk_score,
+        'reasons': reasons,
+        'best_model': best_model_name
+    }
+
+def _lazy_loader(file_path):
+    # Parses the upload on first call only; stages served from the profile cache never call it
+    loaded = []
+    def load():
+        if not loaded:
+            loaded.append(pipeline.read_dataset(file_path))
+        return loaded[0]
+    return load
+
+def _render_home(request, error=None):
+    # Only offer the SSE path under ASGI; WSGI buffers an async stream until it ends
+    return render(request, 'analyzer/home.html', {'error': error, 'streaming': isinstance(request, ASGIRequest)})
 
 def home(request):
     if request.method == 'POST' and request.FILES.get('dataset'):
@@ -25,86 +114,239 @@ def home(request):
             filename = fs.save(myfile.name, myfile)
             file_path = fs.path(filename)
             
-            # Load Data
+            if not filename.endswith(('.csv', '.xlsx')):
+                return _render_home(request, 'Unsupported file format')
+
+            # Load Data lazily: with a warm profile sidecar, cached stages never parse the file
+            load_df = _lazy_loader(file_path)
             try:
-                if filename.endswith('.csv'):
-                    df = pd.read_csv(file_path)
-                elif filename.endswith('.xlsx'):
-                    df = pd.read_excel(file_path)
-                else:
-                    return render(request, 'analyzer/home.html', {'error': 'Unsupported file format'})
+                profile = DatasetProfile.for_upload(file_path, load_df)
             except Exception as e:
-                return render(request, 'analyzer/home.html', {'error': f"Error reading file: {e}"})
+                return _render_home(request, f"Error reading file: {e}")
 
             # 2. Get Form Data
             task_type = request.POST.get('task_type', 'classification')
             target_col = request.POST.get('target_col')
             
             # Cost/Context Inputs
-            context_data = {
-                'task_type': task_type,
-                'decision_criticality': request.POST.get('criticality', 'medium'),
-                'rule_dev_time_hours': int(request.POST.get('rule_dev_hours', 20)),
-                'ml_dev_time_hours': int(request.POST.get('ml_dev_hours', 100)),
-                'training_cost_est': float(request.POST.get('training_cost', 500)),
-                'inference_cost_monthly': float(request.POST.get('inference_cost', 50)),
-                'maintenance_cost_monthly': float(request.POST.get('maint_cost', 100)),
-                'hourly_rate': float(request.POST.get('hourly_rate', 100)),
-            }
-
-            if target_col not in df.columns:
+            context_data = _context_data(request.POST)
+
+            if target_col not in profile.columns:
                  # Clean up details if we fail early
-                return render(request, 'analyzer/home.html', {'error': f"Target column '{target_col}' not found. Columns: {', '.join(df.columns)}"})
+                return _render_home(request, f"Target column '{target_col}' not found. Columns: {', '.join(map(str, profile.columns))}")
 
-            # 3. PIPELINE EXECUTION
+            # 3. PIPELINE EXECUTION (each stage result is cached in the profile sidecar)
             
             # A. Feature Extraction
-            extractor = FeatureExtractor(df, target_col, task_type)
-            stats = extractor.extract_features()
+            stats = profile.cached(('meta_features', target_col, task_type), lambda: FeatureExtractor(
+                load_df(), target_col, task_type, profile).extract_features())
 
             # B. Baseline Stats
-            baseline = BaselineEstimator(df, target_col, task_type)
-            base_score = baseline.get_baseline_performance()
+            base_score = profile.cached(('baseline', target_col, task_type), lambda: BaselineEstimator(
+                load_df(), target_col, task_type, profile).get_baseline_performance())
 
             # C. ML Performance Est
-            ml_est = MLEstimator(df, target_col, task_type)
-            ml_score, ml_std, best_model_name = ml_est.estimate_performance()
+            ml_runs = []
 
-            # D. Cost Model
-            cost_model = CostModel(context_data)
-            cost_res = cost_model.compute_roi_score() # (ratio, rule_cost, ml_cost)
+            def estimate_ml():
+                ml_est = MLEstimator(load_df(), target_col, task_type, executor=_get_executor(),
+                                     search_budget=context_data['search_budget'], profile=profile)
+                ml_runs.append(ml_est)
+                return [*ml_est.estimate_performance(), ml_est.best_params]
 
-            # E. Risk Engine
-            risk_eng = RiskEngine(stats, context_data, ml_std)
-            risk_score = risk_eng.calculate_risk()
+            # A model can fail for transient reasons (a lost worker, a task timeout), so only
+            # cache runs where every candidate was scored
+            ml_score, ml_std, best_model_name, best_params = profile.cached(
+                ('ml', target_col, task_type, context_data['search_budget']), estimate_ml,
+                should_cache=lambda result: result[2] != "None" and not ml_runs[-1].failed_models)
 
-            # F. Decision Engine
-            decider = DecisionEngine(ml_score, base_score, cost_res[0], risk_score)
-            recommendation, reasons = decider.make_decision()
-
-            # G. Explanation, passing best_model_name
-            explainer = ExplainabilityReport(stats, base_score, ml_score, ml_std, cost_res, risk_score, recommendation, reasons, best_model_name)
-            report_text = explainer.generate_report()
+            # D-G. Cost, Risk, Decision, Explanation
+            context = _build_results(stats, base_score, ml_score, ml_std, best_model_name, context_data, best_params, profile)
 
             # Clean up file?
             # os.remove(file_path)
 
-            context = {
-                'report': report_text,
-                'recommendation': recommendation,
-                'stats': stats,
-                'base_score': base_score,
-                'ml_score': ml_score,
-                'cost_res': cost_res,
-                'risk_score': risk_score,
-                'reasons': reasons,
-                'best_model': best_model_name 
-            }
             return render(request, 'analyzer/results.html', context)
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            return render(request, 'analyzer/home.html', {'error': f"Pipeline failed: {e}"})
+            return _render_home(request, f"Pipeline failed: {e}")
+
+    return _render_home(request)
+
+
+# ---------------------------------------------------------------------------
+# Async streaming path (ASGI)
+# The upload is accepted by `analyze`, which returns a job id; `analyze_events` then runs the
+# pipeline stages in a bounded process pool and streams each result as a Server-Sent Event.
+#
+# Pending jobs live in this process's memory, so the events request must reach the same process
+# as the upload: run a single ASGI worker process (e.g. `uvicorn --workers 1`), or use sticky routing.
+# ---------------------------------------------------------------------------
+
+_pool = None
+_jobs = {}  # job_id -> (expiry time, job kwargs)
+JOB_TTL_SECONDS = 300
+
+def _get_pool():
+    # Spawned workers: forking a process that is running an event loop is unsafe
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=getattr(settings, 'ANALYSIS_POOL_WORKERS', None),
+                                    mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+def _reset_pool(broken):
+    # A worker died (e.g. OOM on a huge upload); replace the pool so later requests still work
+    global _pool
+    if _pool is broken:
+        _pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+async def _run_in_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    try:
+        future = loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # Broken by an earlier job, not this one: submit once more on a fresh pool
+        _reset_pool(pool)
+        pool = _get_pool()
+        future = loop.run_in_executor(pool, func, *args)
+    try:
+        return await future
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise
+
+async def _score_model(file_path, profile_path, target_col, task_type, model_name, search_budget):
+    config = getattr(settings, 'ANALYSIS_EXECUTOR', {})
+    if config.get('BACKEND', 'inprocess') == 'inprocess' or search_budget:
+        # The budgeted search never uses the executor (see MLEstimator), so it runs in the pool too
+        return await _run_in_pool(pipeline.score_model, file_path, profile_path, target_col, task_type, model_name, search_budget)
+    # A remote backend does the fitting. Pool workers can't each build one (a distributed coordinator
+    # binds the configured address), so wait on the shared executor from a thread of this process.
+    return await sync_to_async(pipeline.score_model, thread_sensitive=False)(
+        file_path, profile_path, target_col, task_type, model_name, search_budget, _get_executor())
+
+def _expire_jobs():
+    now = time.monotonic()
+    for job_id in [j for j, (expires, _) in _jobs.items() if expires < now]:
+        _jobs.pop(job_id, None)
+
+def _to_json(value):
+    # numpy scalars and other estimator outputs
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=_to_json)}\n\n"
+
+async def analyze(request):
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Upload a dataset to analyze'}, status=400)
+
+    # Multipart parsing (including spooling large uploads to a temp file) happens on first
+    # access to POST/FILES, so do it in a thread rather than on the event loop
+    post, files = await sync_to_async(lambda: (request.POST, request.FILES), thread_sensitive=False)()
+    if not files.get('dataset'):
+        return JsonResponse({'error': 'Upload a dataset to analyze'}, status=400)
+
+    try:
+        context_data = _context_data(post)
+    except ValueError as e:
+        return JsonResponse({'error': f"Invalid form value: {e}"}, status=400)
+    task_type = context_data['task_type']
+    target_col = post.get('target_col')
+
+    # Save the upload off the event loop
+    myfile = files['dataset']
+    fs = FileSystemStorage()
+    filename = await sync_to_async(fs.save, thread_sensitive=False)(myfile.name, myfile)
+    file_path = fs.path(filename)
+
+    try:
+        # Ingest: one pass over the data builds the profile sidecar every later stage reads
+        columns, profile_path = await _run_in_pool(pipeline.ingest, file_path)
+    except Exception as e:
+        return JsonResponse({'error': f"Error reading file: {e}"}, status=400)
+
+    if target_col not in columns:
+        return JsonResponse({'error': f"Target column '{target_col}' not found. Columns: {', '.join(map(str, columns))}"}, status=400)
+
+    # Jobs that are posted but never streamed are dropped after JOB_TTL_SECONDS
+    _expire_jobs()
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = (time.monotonic() + JOB_TTL_SECONDS, {
+        'file_path': file_path,
+        'profile_path': profile_path,
+        'target_col': target_col,
+        'task_type': task_type,
+        'context_data': context_data,
+    })
+    return JsonResponse({'job_id': job_id, 'events_url': reverse('analyze_events', args=[job_id])})
+
+async def analyze_events(request, job_id):
+    # Jobs are one-shot: a reconnecting EventSource gets a 404 instead of re-running the pipeline
+    _expire_jobs()
+    entry = _jobs.pop(job_id, None)
+    if entry is None:
+        raise Http404("Unknown, expired or already streamed job")
+    job = entry[1]
+
+    response = StreamingHttpResponse(_stream_job(**job), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def _stream_job(file_path, profile_path, target_col, task_type, context_data):
+    pending = set()
+    try:
+        # A. Feature Extraction (fast, so users get a first result almost immediately)
+        stats = await _run_in_pool(pipeline.extract_features, file_path, profile_path, target_col, task_type)
+        yield _sse('meta_features', stats)
+
+        # B + C. Baseline and every candidate model are independent, so queue them all at once
+        # model_names() only looks at the task type, the dataset isn't needed here
+        names = MLEstimator(None, target_col, task_type).model_names()
+        # The job's search budget is split evenly, since the families are searched in parallel
+        search_budget = context_data['search_budget'] / max(len(names), 1)
+        base_future = asyncio.ensure_future(_run_in_pool(pipeline.baseline_score, file_path, profile_path, target_col, task_type))
+        model_futures = {
+            asyncio.ensure_future(_score_model(file_path, profile_path, target_col, task_type, name, search_budget)): name
+            for name in names
+        }
+        pending = {base_future, *model_futures}
+
+        base_score = await base_future
+        pending.discard(base_future)
+        yield _sse('baseline', {'score': base_score})
+
+        best_score, best_std, best_model_name, best_params = -float('inf'), 0.0, "None", {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = model_futures[future]
+                try:
+                    score, std, params = future.result()
+                except Exception as e:
+                    yield _sse('model', {'name': name, 'error': str(e)})
+                    continue
+                yield _sse('model', {'name': name, 'score': score, 'std': std, 'params': params})
+                if score > best_score:
+                    best_score, best_std, best_model_name, best_params = score, std, name, params
 
-    return render(request, 'analyzer/home.html')
+        # D-G. Cheap enough to run on the event loop
+        # Only the small sidecar is read here, never the raw upload
+        profile = await sync_to_async(DatasetProfile.load, thread_sensitive=False)(profile_path)
+        context = _build_results(stats, base_score, best_score, best_std, best_model_name, context_data, best_params, profile)
+        yield _sse('result', {
+            'recommendation': context['recommendation'],
+            'html': render_to_string('analyzer/results.html', context),
+        })
+    except Exception as e:
+        yield _sse('pipeline_error', {'error': f"Pipeline failed: {e}"})
+    finally:
+        # Client went away or a stage failed: drop work that hasn't started yet
+        for future in pending:
+            future.cancel()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -116,3 +117,29 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = "static/"
+
+
+# Model evaluation executor (see src/executors.py)
+# "inprocess" runs every fit inside the web process. "distributed" serves (model, fold)
+# tasks to TCP workers started with `python -m src.executors worker --host H --port P`.
+# SECURITY WARNING: workers and coordinator unpickle each other's messages, so anyone holding
+# the authkey can run code on them. Set FEASIBILITY_AUTHKEY to a long random secret on every
+# node, and only bind a private interface. A non-loopback address without an authkey is refused.
+# Only the fixed candidates go through the executor: with a non-zero search budget, the
+# successive-halving search always runs in the web process.
+
+ANALYSIS_EXECUTOR = {
+    "BACKEND": "inprocess",
+    "OPTIONS": {
+        # Only used by the distributed backend
+        # "address": ("10.0.0.5", 50000),
+        # "authkey": os.environ.get("FEASIBILITY_AUTHKEY"),
+        # "local_workers": 4,
+    },
+}
+
+# Process pool for the async streaming view (analyzer.views.analyze_events).
+# Bounds how many CPU-bound pipeline stages run at once per ASGI worker; None = one per CPU.
+# Pending streaming jobs are kept in process memory: serve with a single ASGI worker process.
+
+ANALYSIS_POOL_WORKERS = None
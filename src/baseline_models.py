@@ -4,10 +4,12 @@ import numpy as np
 import pandas as pd
 
 class BaselineEstimator:
-    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str):
+    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str, profile=None):
         self.df = dataset
         self.target_col = target_column
         self.task_type = task_type
+        # Optional DatasetProfile, used to skip the NaN scan when the target has no missing values
+        self.profile = profile
 
     def get_baseline_performance(self):
         """
@@ -19,7 +21,10 @@ class BaselineEstimator:
         # Simple preprocessing (drop NaN for baseline calculation)
         # In a real system, we'd handle this better, but for baseline, we want 'dumb' performance
         # We'll just drop rows for the estimator to run
-        clean_df = self.df.dropna(subset=[self.target_col])
+        if self.profile is not None and self.profile.column(self.target_col)['null_count'] == 0:
+            clean_df = self.df
+        else:
+            clean_df = self.df.dropna(subset=[self.target_col])
         if len(clean_df) == 0:
             return 0.0
 
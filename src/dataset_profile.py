@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows: concurrent saves may then drop an entry, which is just recomputed later
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+
+def _plain(value):
+    # numpy scalars -> python scalars so the profile stays plain JSON
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _json_default(value):
+    # Anything json can't encode natively (numpy scalars, timestamps in value counts, ...)
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+
+@contextmanager
+def _locked(path):
+    # Exclusive lock on a .lock file next to the sidecar, held across read-merge-replace
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class DatasetProfile:
+    """
+    Compact per-dataset profile, built once at ingest and stored as a JSON sidecar next to the upload.
+
+    Holds per-column dtype, null count, distinct count, min/max/moments for numeric columns and value
+    counts (complete up to MAX_DISTINCT values, otherwise the TOP_K most frequent). Stage results are
+    cached in it too, so re-analysing the same file never re-reads the raw data.
+    """
+    TOP_K = 20
+    MAX_DISTINCT = 100
+
+    def __init__(self, data: dict, path=None):
+        self.data = data
+        self.path = path
+
+    @staticmethod
+    def sidecar_path(file_path):
+        """
+        Content-addressed: re-uploading the same file (under any name) finds the existing profile.
+        """
+        h = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        return os.path.join(os.path.dirname(file_path), f"{h.hexdigest()}.profile.json")
+
+    @classmethod
+    def for_upload(cls, file_path, load_dataset, path=None):
+        """
+        Returns the sidecar profile for an uploaded file, building it (one load of the data) if missing.
+        load_dataset is only called on a miss.
+        """
+        path = path or cls.sidecar_path(file_path)
+        if os.path.exists(path):
+            return cls.load(path)
+        profile = cls.build(load_dataset())
+        profile.path = path
+        profile.save()
+        return profile
+
+    @classmethod
+    def build(cls, df: pd.DataFrame):
+        # Column-wise reductions over the whole frame rather than per-column Python loops
+        null_counts = df.isnull().sum()
+        n_unique = df.nunique()
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = set(df.select_dtypes(include=['object', 'category']).columns)
+        moments = df[numeric_cols].agg(['min', 'max', 'mean', 'std', 'skew']) if len(numeric_cols) else pd.DataFrame()
+
+        columns = []
+        for col in df.columns:
+            if col in numeric_cols:
+                kind = 'numeric'
+            elif col in categorical_cols:
+                kind = 'categorical'
+            else:
+                kind = 'other'
+
+            distinct = int(n_unique[col])
+            counts = df[col].value_counts()
+            if distinct > cls.MAX_DISTINCT:
+                counts = counts.head(cls.TOP_K)
+
+            entry = {
+                'name': col,
+                'dtype': str(df[col].dtype),
+                'kind': kind,
+                'null_count': int(null_counts[col]),
+                'n_unique': distinct,
+                'value_counts': [[_plain(v), int(c)] for v, c in counts.items()],
+                'value_counts_complete': distinct <= cls.MAX_DISTINCT,
+            }
+            if kind == 'numeric':
+                entry.update({stat: _plain(moments.at[stat, col]) for stat in moments.index})
+            columns.append(entry)
+
+        return cls({'n_rows': len(df), 'columns': columns, 'results': {}})
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f), path)
+
+    def save(self):
+        if self.path is None:
+            return
+        # Parallel stages (separate pool workers) may each cache a result; under the lock, keep
+        # what's already on disk and add ours
+        with _locked(self.path):
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    on_disk = json.load(f).get('results', {})
+                self.data['results'] = {**on_disk, **self.data['results']}
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.data, f, default=_json_default)
+            os.replace(tmp_path, self.path)
+
+    # --- Column queries -----------------------------------------------------
+
+    @property
+    def n_rows(self):
+        return self.data['n_rows']
+
+    @property
+    def columns(self):
+        return [c['name'] for c in self.data['columns']]
+
+    def column(self, name):
+        for c in self.data['columns']:
+            if c['name'] == name:
+                return c
+        raise KeyError(name)
+
+    def missing_ratio(self):
+        # Same as df.isnull().mean().mean()
+        cols = self.data['columns']
+        if not cols or self.n_rows == 0:
+            return 0.0
+        return sum(c['null_count'] for c in cols) / (self.n_rows * len(cols))
+
+    def columns_with_dtype(self, dtypes, exclude=()):
+        return [c['name'] for c in self.data['columns'] if c['dtype'] in dtypes and c['name'] not in exclude]
+
+    def categorical_columns(self, exclude=()):
+        return [c['name'] for c in self.data['columns'] if c['kind'] == 'categorical' and c['name'] not in exclude]
+
+    def value_distribution(self, name):
+        """
+        Normalized value counts (like Series.value_counts(normalize=True)), or None when only the
+        top-k values were kept.
+        """
+        col = self.column(name)
+        if not col['value_counts_complete']:
+            return None
+        counts = pd.Series([c for _, c in col['value_counts']], index=[v for v, _ in col['value_counts']], dtype=float)
+        total = counts.sum()
+        return counts / total if total else counts
+
+    # --- Cached stage results -----------------------------------------------
+
+    def cached(self, key_parts, compute, should_cache=None):
+        """
+        Returns the stored result for key_parts (e.g. ('baseline', target, task_type)), or runs
+        compute() and persists its result in the sidecar.
+        should_cache(result) can veto persisting it, so a failed run is retried next time instead
+        of being served from the sidecar forever.
+        """
+        key = "|".join(str(p) for p in key_parts)
+        if key in self.data['results']:
+            return self.data['results'][key]
+        # Returned as it will read back from the sidecar (tuples become lists, numpy scalars
+        # python ones), so a fresh run and a cache hit render the same
+        result = json.loads(json.dumps(compute(), default=_json_default))
+        if should_cache is None or should_cache(result):
+            self.data['results'][key] = result
+            self.save()
+        return result
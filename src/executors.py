@@ -0,0 +1,424 @@
+import hashlib
+import ipaddress
+import os
+import queue
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from multiprocessing import Process
+from multiprocessing.managers import BaseManager
+
+import joblib
+import pandas as pd
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import check_cv
+
+
+def evaluate_fold(X, y, estimator, train_idx, test_idx):
+    """
+    Fits a fresh copy of the estimator on one CV fold and returns its default score
+    (accuracy for classifiers, R2 for regressors) - the same number cross_val_score reports.
+    """
+    model = clone(estimator)
+    model.fit(X.iloc[train_idx], y.iloc[train_idx])
+    return model.score(X.iloc[test_idx], y.iloc[test_idx])
+
+
+def _run_task(X, y, task):
+    estimator, train_idx, test_idx = task
+    try:
+        return evaluate_fold(X, y, estimator, train_idx, test_idx)
+    except Exception as e:
+        # Failures are returned, not raised, so one broken model doesn't sink the whole job
+        return e
+
+
+class InProcessExecutor:
+    """
+    Default backend: runs every (model, fold) task sequentially in the calling process.
+    """
+
+    def run_tasks(self, X, y, tasks):
+        """
+        tasks: list of (estimator, train_idx, test_idx).
+        Returns one entry per task, in order: a float score or the Exception that was raised.
+        """
+        return [_run_task(X, y, task) for task in tasks]
+
+    def close(self):
+        pass
+
+
+class DatasetStore:
+    """
+    Content-addressed on-disk dataset cache.
+    Each (X, y) pair is written once under the hash of its contents and loaded back
+    memory-mapped, so workers never receive the data pickled inside a task.
+    Least recently used files are deleted beyond max_bytes, and at most max_loaded
+    datasets stay mapped in this process.
+    """
+
+    def __init__(self, root=None, max_bytes=2 * 1024 ** 3, max_loaded=2):
+        self.root = root or os.path.join(tempfile.gettempdir(), 'feasibility_datasets')
+        os.makedirs(self.root, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+
+    @staticmethod
+    def dataset_key(X, y):
+        h = hashlib.sha256()
+        h.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+        h.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+        h.update(repr((list(X.columns), [str(t) for t in X.dtypes], y.name, str(y.dtype))).encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, f"{key}.joblib")
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, X, y):
+        key = self.dataset_key(X, y)
+        if not self.exists(key):
+            self._write(key, lambda f: joblib.dump((X, y), f))
+        self._touch(key)
+        return key
+
+    def load(self, key):
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+        else:
+            self._loaded[key] = joblib.load(self.path(key), mmap_mode='r')
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        self._touch(key)
+        return self._loaded[key]
+
+    def read_bytes(self, key):
+        with open(self.path(key), 'rb') as f:
+            return f.read()
+
+    def write_bytes(self, key, data):
+        if not self.exists(key):
+            self._write(key, lambda f: f.write(data))
+
+    def _write(self, key, writer):
+        # Write to a temp file first so concurrent readers never see a half-written dataset
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            os.replace(tmp_path, self.path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune(keep=key)
+
+    def _touch(self, key):
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _prune(self, keep):
+        # Oldest (by last use) first; files still mapped elsewhere stay readable after unlink on POSIX
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.joblib'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.root, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == f"{keep}.joblib":
+                continue
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class _ResultBoard:
+    """
+    Per-job result queues, so concurrent jobs sharing one worker pool don't see each other's results.
+    Only jobs opened by the coordinator exist; late results for a finished or timed-out job are dropped.
+    """
+
+    def __init__(self):
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def open(self, job_id):
+        with self._lock:
+            self._queues[job_id] = queue.Queue()
+
+    def is_active(self, job_id):
+        with self._lock:
+            return job_id in self._queues
+
+    def put(self, job_id, item):
+        with self._lock:
+            q = self._queues.get(job_id)
+        if q is not None:
+            q.put(item)
+
+    def get(self, job_id, timeout=None):
+        with self._lock:
+            q = self._queues[job_id]
+        return q.get(timeout=timeout)
+
+    def discard(self, job_id):
+        with self._lock:
+            self._queues.pop(job_id, None)
+
+
+class _DatasetRegistry:
+    """
+    Holds dataset bytes on the coordinator for workers that don't share its filesystem.
+    Reference-counted per running job, so bytes are only kept while some job still needs them.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    def retain(self, key):
+        # Returns whether the bytes are already held, so the caller only uploads them once
+        with self._lock:
+            self._refs[key] = self._refs.get(key, 0) + 1
+            return key in self._data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._refs:
+                self._data.setdefault(key, data)
+
+    def release(self, key):
+        with self._lock:
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+                self._data.pop(key, None)
+
+    def get(self, key):
+        with self._lock:
+            return self._data[key]
+
+
+# Server-side singletons, created inside the manager process
+_task_queue = queue.Queue()
+_result_board = _ResultBoard()
+_dataset_registry = _DatasetRegistry()
+
+
+def _get_task_queue():
+    return _task_queue
+
+
+def _get_result_board():
+    return _result_board
+
+
+def _get_dataset_registry():
+    return _dataset_registry
+
+
+class _CoordinatorManager(BaseManager):
+    pass
+
+
+_CoordinatorManager.register('tasks', callable=_get_task_queue)
+_CoordinatorManager.register('results', callable=_get_result_board)
+_CoordinatorManager.register('datasets', callable=_get_dataset_registry)
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register('tasks')
+_WorkerManager.register('results')
+_WorkerManager.register('datasets')
+
+
+def run_worker(address, authkey, store_root=None):
+    """
+    Worker loop: connects to a coordinator over TCP and evaluates (model, fold) tasks until
+    it receives the shutdown sentinel. Datasets are fetched at most once per worker host
+    and read memory-mapped from the local DatasetStore afterwards.
+    """
+    manager = _WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    tasks, results, datasets = manager.tasks(), manager.results(), manager.datasets()
+    store = DatasetStore(store_root)
+
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        job_id, task_idx, key, task = item
+        if not results.is_active(job_id):
+            # The coordinator already gave up on this job (timeout); don't spend time on it
+            continue
+        try:
+            X, y = _fetch_dataset(store, datasets, key)
+        except Exception as e:
+            results.put(job_id, (task_idx, e))
+            continue
+        results.put(job_id, (task_idx, _run_task(X, y, task)))
+
+
+def _fetch_dataset(store, datasets, key):
+    for _ in range(2):
+        if not store.exists(key):
+            store.write_bytes(key, datasets.get(key))
+        try:
+            return store.load(key)
+        except FileNotFoundError:
+            # Pruned between exists() and load() by another process sharing the store; fetch again
+            continue
+    raise FileNotFoundError(f"Dataset {key} disappeared from {store.root}")
+
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def resolve_authkey(authkey=None):
+    """
+    The manager unpickles whatever it receives, so the authkey is the only thing standing between
+    the network and code execution on the coordinator and workers. There is no built-in default:
+    it comes from the caller (settings) or the FEASIBILITY_AUTHKEY environment variable.
+    """
+    if authkey is None:
+        authkey = os.environ.get('FEASIBILITY_AUTHKEY') or None
+    if isinstance(authkey, str):
+        authkey = authkey.encode()
+    return authkey
+
+
+class DistributedExecutor:
+    """
+    Runs (model, fold) tasks on a pool of workers behind a multiprocessing manager.
+    Remote workers join with `FEASIBILITY_AUTHKEY=... python -m src.executors worker --host H --port P`;
+    `local_workers` spawns that many on this machine (handy for testing).
+    """
+
+    def __init__(self, address=('127.0.0.1', 50000), authkey=None, local_workers=0,
+                 store_root=None, task_timeout=600):
+        authkey = resolve_authkey(authkey)
+        if authkey is None:
+            if not _is_loopback(address[0]):
+                raise ValueError("DistributedExecutor needs an authkey (settings or FEASIBILITY_AUTHKEY) "
+                                 "when listening on a non-loopback address")
+            # Loopback only: a random key is enough, local workers inherit it
+            authkey = os.urandom(32)
+
+        self.store = DatasetStore(store_root)
+        self.task_timeout = task_timeout
+
+        self._manager = _CoordinatorManager(address=address, authkey=authkey)
+        self._manager.start()
+        self.address = self._manager.address
+        self._tasks = self._manager.tasks()
+        self._results = self._manager.results()
+        self._datasets = self._manager.datasets()
+
+        self._workers = []
+        for _ in range(local_workers):
+            p = Process(target=run_worker, args=(self.address, authkey, self.store.root), daemon=True)
+            p.start()
+            self._workers.append(p)
+
+    def run_tasks(self, X, y, tasks):
+        key = self.store.put(X, y)
+        job_id = uuid.uuid4().hex
+        self._results.open(job_id)
+        already_held = self._datasets.retain(key)
+
+        outcomes = [None] * len(tasks)
+        try:
+            # Shipped to the coordinator once while any job uses it; each remote host pulls it at most once
+            if not already_held:
+                self._datasets.put(key, self.store.read_bytes(key))
+            for task_idx, task in enumerate(tasks):
+                self._tasks.put((job_id, task_idx, key, task))
+            for _ in range(len(tasks)):
+                try:
+                    task_idx, outcome = self._results.get(job_id, self.task_timeout)
+                except queue.Empty:
+                    timeout = TimeoutError(f"No worker result within {self.task_timeout}s")
+                    return [o if o is not None else timeout for o in outcomes]
+                outcomes[task_idx] = outcome
+        finally:
+            # Late results for this job are dropped and its queued tasks skipped by workers
+            self._results.discard(job_id)
+            self._datasets.release(key)
+        return outcomes
+
+    def close(self):
+        for _ in self._workers:
+            self._tasks.put(None)
+        for p in self._workers:
+            p.join(timeout=5)
+        self._manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_cv_tasks(estimators, X, y, cv=5):
+    """
+    Expands named estimators into (model, fold) tasks using the same splitter cross_val_score
+    would pick (stratified for classifiers). Returns (names, tasks) aligned index by index.
+    """
+    names, tasks = [], []
+    for name, estimator in estimators:
+        splitter = check_cv(cv, y, classifier=is_classifier(estimator))
+        for train_idx, test_idx in splitter.split(X, y):
+            names.append(name)
+            tasks.append((estimator, train_idx, test_idx))
+    return names, tasks
+
+
+def get_executor(backend='inprocess', **options):
+    if backend == 'inprocess':
+        return InProcessExecutor()
+    elif backend == 'distributed':
+        return DistributedExecutor(**options)
+    raise ValueError(f"Unknown executor backend '{backend}'")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FeasibilityAI evaluation worker")
+    parser.add_argument('command', choices=['worker'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=50000)
+    parser.add_argument('--store', default=None, help="Local dataset cache directory")
+    args = parser.parse_args()
+
+    authkey = resolve_authkey()
+    if authkey is None:
+        parser.error("set FEASIBILITY_AUTHKEY to the coordinator's authkey")
+    run_worker((args.host, args.port), authkey, args.store)
@@ -1,5 +1,5 @@
 class ExplainabilityReport:
-    def __init__(self, data_stats, baseline_score, ml_score, ml_std, cost_data, risk_score, recommendation, reasons, best_model_name="N/A"):
+    def __init__(self, data_stats, baseline_score, ml_score, ml_std, cost_data, risk_score, recommendation, reasons, best_model_name="N/A", best_params=None):
         self.stats = data_stats
         self.baseline = baseline_score
         self.ml_score = ml_score
@@ -9,8 +9,14 @@ class ExplainabilityReport:
         self.recommendation = recommendation
         self.reasons = reasons
         self.best_model_name = best_model_name
+        self.best_params = best_params or {}
 
     def generate_report(self):
+        # Only present when the budgeted hyperparameter search ran
+        best_config = ""
+        if self.best_params:
+            best_config = "\n  [Best Config: " + ", ".join(f"{k}={v}" for k, v in sorted(self.best_params.items())) + "]"
+
         report = f"""
 =========================================
 AI FEASIBILITY ASSESSMENT REPORT
@@ -30,7 +36,7 @@ Reasoning:
 2. PERFORMANCE PROJECTIONS
 - Baseline (Rules/Simple): {self.baseline:.2%}
 - ML Model Est.: {self.ml_score:.2%} (±{self.ml_std:.2%})
-  [Best Model: {self.best_model_name}]
+  [Best Model: {self.best_model_name}]{best_config}
 - Lift: {self.ml_score - self.baseline:+.2%}
 
 3. COST ROI ANALYSIS
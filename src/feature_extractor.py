@@ -7,16 +7,19 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import LabelEncoder
 
 class FeatureExtractor:
-    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str):
+    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str, profile=None):
         self.df = dataset
         self.target_col = target_column
         self.task_type = task_type
+        # Optional DatasetProfile: column stats come from it instead of rescanning the DataFrame
+        self.profile = profile
 
     def extract_features(self):
         """
         Extracts meta-features from the dataset.
         """
-        if self.target_col not in self.df.columns:
+        columns = self.profile.columns if self.profile is not None else self.df.columns
+        if self.target_col not in columns:
             raise ValueError(f"Target column '{self.target_col}' not found in dataset")
 
         X = self.df.drop(columns=[self.target_col])
@@ -27,12 +30,17 @@ class FeatureExtractor:
         n_features = X.shape[1]
         
         # 2. Missing Values
-        missing_ratio = self.df.isnull().mean().mean()
+        if self.profile is not None:
+            missing_ratio = self.profile.missing_ratio()
+        else:
+            missing_ratio = self.df.isnull().mean().mean()
         
         # 3. Handle categorical target for metrics
         if self.task_type == 'classification':
              # Cardinality and Entropy of target
-            y_counts = y.value_counts(normalize=True)
+            y_counts = self.profile.value_distribution(self.target_col) if self.profile is not None else None
+            if y_counts is None:
+                y_counts = y.value_counts(normalize=True)
             label_entropy = entropy(y_counts)
             imbalance_ratio = y_counts.max() / y_counts.min() if len(y_counts) > 0 else 0
         else:
@@ -42,11 +50,15 @@ class FeatureExtractor:
 
         # 4. Feature Cardinality (Avg unique values per column for categorical-like cols)
         # We'll treat object/category columns as categorical
-        cat_cols = X.select_dtypes(include=['object', 'category']).columns
-        if len(cat_cols) > 0:
-            feature_cardinality_avg = X[cat_cols].nunique().mean()
+        if self.profile is not None:
+            cat_cards = [self.profile.column(c)['n_unique'] for c in self.profile.categorical_columns(exclude=[self.target_col])]
+            feature_cardinality_avg = np.mean(cat_cards) if cat_cards else 0.0
         else:
-            feature_cardinality_avg = 0.0
+            cat_cols = X.select_dtypes(include=['object', 'category']).columns
+            if len(cat_cols) > 0:
+                feature_cardinality_avg = X[cat_cols].nunique().mean()
+            else:
+                feature_cardinality_avg = 0.0
 
         # 5. Signal to Noise Estimation
         # Heuristic: Train a simple shallow tree. If it fails to find signal, data might be noise.
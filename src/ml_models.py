@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import cross_val_score
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.impute import SimpleImputer
@@ -9,12 +8,23 @@ from sklearn.linear_model import LogisticRegression, LinearRegression
 # from xgboost import XGBClassifier, XGBRegressor # XGBoost removed due to missing libomp dependency
 from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
 from sklearn.neural_network import MLPClassifier, MLPRegressor
+from .executors import InProcessExecutor, build_cv_tasks
+from .model_search import ModelSearch
 
 class MLEstimator:
-    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str):
+    def __init__(self, dataset: pd.DataFrame, target_column: str, task_type: str, executor=None, search_budget=None, profile=None):
         self.df = dataset
         self.target_col = target_column
         self.task_type = task_type
+        # Runs the (model, fold) fits; see src/executors.py for the distributed backend
+        self.executor = executor or InProcessExecutor()
+        # Seconds for the budgeted hyperparameter search; None/0 keeps the fixed candidates below
+        self.search_budget = search_budget
+        self.best_params = {}
+        # Model families that failed in the last estimate_performance() (every configuration raised, in search mode)
+        self.failed_models = []
+        # Optional DatasetProfile: column types come from it instead of rescanning the DataFrame
+        self.profile = profile
 
     def estimate_performance(self):
         """
@@ -24,13 +34,82 @@ class MLEstimator:
         2. RandomForest (Robust bagging)
         3. GradientBoosting (Boosting)
         4. MLP (Neural Network / Deep Learning proxy)
+
+        With a search_budget, each family is tuned by ModelSearch instead and the winning
+        configuration is left in self.best_params.
         """
-        X = self.df.drop(columns=[self.target_col])
-        y = self.df[self.target_col]
+        if self.search_budget:
+            search = self._search()
+            best_score, best_std, best_model_name, self.best_params = search.run()
+            self.failed_models = search.failed_families
+            return best_score, best_std, best_model_name
+
+        pipelines = self.build_pipelines()
+        if not pipelines:
+            return 0.0, 0.0, "None"
+
+        best_score = -float('inf')
+        best_std = 0.0
+        best_model_name = "None"
+        self.failed_models = []
+
+        for name, result in self._cross_validate(pipelines).items():
+            if isinstance(result, Exception):
+                print(f"Model {name} failed: {result}")
+                self.failed_models.append(name)
+                continue
+
+            avg_score = result.mean()
+            if avg_score > best_score:
+                best_score = avg_score
+                best_std = result.std()
+                best_model_name = name
+
+        return best_score, best_std, best_model_name
+
+    def score_model(self, model_name):
+        """
+        Cross-validates a single candidate by name and returns (mean, std).
+        Used by the streaming view to report each model as soon as it finishes.
+        """
+        if self.search_budget:
+            if model_name not in self.model_names():
+                raise ValueError(f"Unknown model '{model_name}' for task '{self.task_type}'")
+            score, std, _, self.best_params = self._search(families=[model_name]).run()
+            if score == -float('inf'):
+                raise ValueError(f"Model search failed for '{model_name}'")
+            return score, std
+
+        pipelines = [(name, clf) for name, clf in self.build_pipelines() if name == model_name]
+        if not pipelines:
+            raise ValueError(f"Unknown model '{model_name}' for task '{self.task_type}'")
+
+        result = self._cross_validate(pipelines)[model_name]
+        if isinstance(result, Exception):
+            raise result
+        return result.mean(), result.std()
 
+    def model_names(self):
+        return [name for name, _ in self._candidate_models()]
+
+    def build_pipelines(self):
+        """
+        Returns [(name, Pipeline)] with the shared preprocessing in front of each candidate.
+        """
+        preprocessor = self.build_preprocessor()
+        return [(name, Pipeline(steps=[('preprocessor', preprocessor),
+                                       ('classifier', model)]))
+                for name, model in self._candidate_models()]
+
+    def build_preprocessor(self):
         # Identify column types
-        numeric_features = X.select_dtypes(include=['int64', 'float64']).columns
-        categorical_features = X.select_dtypes(include=['object', 'category']).columns
+        if self.profile is not None:
+            numeric_features = self.profile.columns_with_dtype(['int64', 'float64'], exclude=[self.target_col])
+            categorical_features = self.profile.categorical_columns(exclude=[self.target_col])
+        else:
+            X = self.df.drop(columns=[self.target_col])
+            numeric_features = X.select_dtypes(include=['int64', 'float64']).columns
+            categorical_features = X.select_dtypes(include=['object', 'category']).columns
 
         # Pipelining
         numeric_transformer = Pipeline(steps=[
@@ -43,47 +122,54 @@ class MLEstimator:
             ('onehot', OneHotEncoder(handle_unknown='ignore'))
         ])
 
-        preprocessor = ColumnTransformer(
+        return ColumnTransformer(
             transformers=[
                 ('num', numeric_transformer, numeric_features),
                 ('cat', categorical_transformer, categorical_features)
             ])
 
+    def _candidate_models(self):
         if self.task_type == 'classification':
-            models = [
+            return [
                 ('LogisticRegression', LogisticRegression(max_iter=1000)),
                 ('RandomForest', RandomForestClassifier(n_estimators=50, random_state=42)),
                 ('GradientBoosting', GradientBoostingClassifier(n_estimators=50, random_state=42)),
                 ('NeuralNetwork (MLP)', MLPClassifier(hidden_layer_sizes=(64, 32), max_iter=500, random_state=42))
             ]
         elif self.task_type == 'regression':
-            models = [
+            return [
                 ('LinearRegression', LinearRegression()),
                 ('RandomForest', RandomForestRegressor(n_estimators=50, random_state=42)),
                 ('GradientBoosting', GradientBoostingRegressor(n_estimators=50, random_state=42)),
                 ('NeuralNetwork (MLP)', MLPRegressor(hidden_layer_sizes=(64, 32), max_iter=500, random_state=42))
             ]
-        else:
-            return 0.0, 0.0, "None"
+        return []
 
-        best_score = -float('inf')
-        best_std = 0.0
-        best_model_name = "None"
+    def _search(self, families=None):
+        X = self.df.drop(columns=[self.target_col])
+        y = self.df[self.target_col]
+        # The fixed candidates are the search's baselines, so it never reports less than the fixed path
+        return ModelSearch(X, y, self.task_type, self.build_preprocessor(), self.search_budget,
+                           baselines=dict(self._candidate_models()), families=families)
 
-        for name, model in models:
-            clf = Pipeline(steps=[('preprocessor', preprocessor),
-                                  ('classifier', model)])
-            
-            try:
-                # 5-fold CV
-                scores = cross_val_score(clf, X, y, cv=5)
-                avg_score = scores.mean()
-                if avg_score > best_score:
-                    best_score = avg_score
-                    best_std = scores.std()
-                    best_model_name = name
-            except Exception as e:
-                print(f"Model {name} failed: {e}")
-                continue
+    def _cross_validate(self, pipelines):
+        """
+        5-fold CV, one executor task per (model, fold).
+        Returns {name: np.array of fold scores, or the first Exception raised for that model}.
+        """
+        X = self.df.drop(columns=[self.target_col])
+        y = self.df[self.target_col]
 
-        return best_score, best_std, best_model_name
+        try:
+            task_names, tasks = build_cv_tasks(pipelines, X, y, cv=5)
+        except ValueError as e:
+            # E.g. too few samples for 5-fold
+            return {name: e for name, _ in pipelines}
+        outcomes = self.executor.run_tasks(X, y, tasks)
+
+        results = {}
+        for name, _ in pipelines:
+            model_outcomes = [o for n, o in zip(task_names, outcomes) if n == name]
+            errors = [o for o in model_outcomes if isinstance(o, Exception)]
+            results[name] = errors[0] if errors else np.array(model_outcomes)
+        return results
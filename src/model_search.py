@@ -0,0 +1,195 @@
+import math
+import time
+import warnings
+from itertools import chain, zip_longest
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.model_selection import ParameterGrid, check_cv
+from sklearn.linear_model import LogisticRegression, LinearRegression
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
+from sklearn.neural_network import MLPClassifier, MLPRegressor
+
+
+def search_space(task_type):
+    """
+    Candidate families for the budgeted search: (name, base estimator, param grid, fidelity param, min resource).
+    The fidelity param is grown between rungs and reused via warm_start; None means the model is
+    cheap enough to fit at full fidelity once. The fixed MLEstimator models aren't listed here, they
+    are passed to ModelSearch as baselines.
+    """
+    if task_type == 'classification':
+        return [
+            ('LogisticRegression', LogisticRegression(max_iter=1000),
+             {'C': [0.1, 10.0]}, None, None),
+            ('RandomForest', RandomForestClassifier(warm_start=True, random_state=42),
+             {'max_depth': [None, 8], 'min_samples_leaf': [1, 5]}, 'n_estimators', 20),
+            ('GradientBoosting', GradientBoostingClassifier(warm_start=True, random_state=42),
+             {'learning_rate': [0.1, 0.05], 'max_depth': [3, 5]}, 'n_estimators', 20),
+            ('NeuralNetwork (MLP)', MLPClassifier(warm_start=True, random_state=42),
+             {'hidden_layer_sizes': [(64, 32), (128,)], 'alpha': [1e-4, 1e-2]}, 'max_iter', 50),
+        ]
+    elif task_type == 'regression':
+        return [
+            # Nothing to tune beyond the baseline
+            ('LinearRegression', LinearRegression(), None, None, None),
+            ('RandomForest', RandomForestRegressor(warm_start=True, random_state=42),
+             {'max_depth': [None, 8], 'min_samples_leaf': [1, 5]}, 'n_estimators', 20),
+            ('GradientBoosting', GradientBoostingRegressor(warm_start=True, random_state=42),
+             {'learning_rate': [0.1, 0.05], 'max_depth': [3, 5]}, 'n_estimators', 20),
+            ('NeuralNetwork (MLP)', MLPRegressor(warm_start=True, random_state=42),
+             {'hidden_layer_sizes': [(64, 32), (128,)], 'alpha': [1e-4, 1e-2]}, 'max_iter', 50),
+        ]
+    return []
+
+
+class ModelSearch:
+    """
+    Multi-fidelity hyperparameter search (successive halving) under one wall-clock budget.
+
+    baselines maps a family name to its fixed estimator (MLEstimator's defaults, e.g. 50 trees or
+    500 MLP epochs). Each is scored first, at that full fidelity, even when the budget is already
+    spent, so a search never reports less than the fixed model of the same family.
+
+    Every grid configuration starts at rung 0 with a small resource (few trees / boosting stages /
+    MLP epochs). After each rung only the top 1/eta survive, and their resource grows by eta.
+    Fitted models are kept per (config, fold) and continued with warm_start, so a promotion only
+    pays for the extra trees/epochs. Preprocessing is fitted once per fold and shared.
+    """
+
+    def __init__(self, X, y, task_type, preprocessor, budget_seconds, baselines=None, families=None,
+                 cv=5, eta=3, max_rungs=3):
+        if not math.isfinite(budget_seconds) or budget_seconds < 0:
+            raise ValueError(f"Search budget must be a finite number of seconds >= 0, got {budget_seconds}")
+        self.X = X
+        self.y = y
+        self.task_type = task_type
+        self.preprocessor = preprocessor
+        self.budget = budget_seconds
+        self.baselines = baselines or {}
+        self.families = families
+        self.cv = cv
+        self.eta = eta
+        self.max_rungs = max_rungs
+
+    def run(self):
+        """
+        Returns (best_score, best_std, best_model_name, best_params).
+        best_params includes the fidelity reached (e.g. n_estimators), so it is a reproducible configuration.
+        Families without a single successfully scored candidate are left in self.failed_families.
+        """
+        space = [s for s in search_space(self.task_type) if self.families is None or s[0] in self.families]
+        per_family = []
+        for name, estimator, grid, fidelity, r_min in space:
+            configs = [{'name': name, 'estimator': estimator, 'params': params, 'fidelity': fidelity, 'r_min': r_min,
+                        'rung': -1, 'scores': None, 'error': None}
+                       for params in (ParameterGrid(grid) if grid else [])]
+            if name in self.baselines:
+                # Fitted as is (fidelity None); reported with the tuned keys and fidelity it was fitted with
+                baseline = self.baselines[name]
+                keys = [*(grid or {}), *([fidelity] if fidelity else [])]
+                configs.insert(0, {'name': name, 'estimator': baseline,
+                                   'params': {k: baseline.get_params()[k] for k in keys}, 'fidelity': None,
+                                   'r_min': None, 'rung': -1, 'scores': None, 'error': None})
+            per_family.append(configs)
+        # Round-robin across families, so running out of budget trims configurations evenly
+        # instead of leaving whole families unfitted
+        candidates = [c for c in chain.from_iterable(zip_longest(*per_family)) if c is not None]
+        self.candidates = candidates
+        self.failed_families = []
+        if not candidates:
+            return 0.0, 0.0, "None", {}
+
+        start = time.perf_counter()
+        try:
+            folds = self._prepare_folds()
+        except ValueError as e:
+            # E.g. too few samples for 5-fold
+            print(f"Model search failed: {e}")
+            self.failed_families = [family[0]['name'] for family in per_family if family]
+            return -float('inf'), 0.0, "None", {}
+        models = {}  # (candidate index, fold index) -> fitted estimator, continued with warm_start
+
+        survivors = list(range(len(candidates)))
+        for rung in range(self.max_rungs):
+            out_of_budget = False
+            for ci in survivors:
+                cand = candidates[ci]
+                if time.perf_counter() - start > self.budget:
+                    # Every family still gets its first candidate (the baseline, when given) scored,
+                    # so a tight budget can't drop a model family from the comparison
+                    family_scored = any(c['name'] == cand['name'] and (c['rung'] >= 0 or c['error'] is not None)
+                                        for c in candidates)
+                    if rung > 0 or family_scored:
+                        out_of_budget = True
+                        continue
+                self._evaluate(ci, cand, rung, folds, models)
+
+            if out_of_budget:
+                break
+            # Full-fidelity models (baselines, linear models) don't improve with more resource: their
+            # rung 0 score is final, so only the others compete for promotion
+            scored = [ci for ci in survivors if candidates[ci]['rung'] == rung and candidates[ci]['fidelity'] is not None]
+            if not scored:
+                break
+            n_keep = max(1, math.ceil(len(scored) / self.eta))
+            survivors = sorted(scored, key=lambda ci: candidates[ci]['scores'].mean(), reverse=True)[:n_keep]
+            # Eliminated configs will never be continued, so release their fitted models
+            models = {key: m for key, m in models.items() if key[0] in survivors}
+
+        finished = [c for c in candidates if c['rung'] >= 0 and c['error'] is None]
+        self.failed_families = [family[0]['name'] for family in per_family
+                                if family and not any(c['rung'] >= 0 and c['error'] is None for c in family)]
+        if not finished:
+            errors = [c['error'] for c in candidates if c['error'] is not None]
+            if errors:
+                print(f"Model search failed: {errors[0]}")
+            return -float('inf'), 0.0, "None", {}
+
+        # Each candidate's latest (most trained) scores; more resource rarely lowers a score, so
+        # this never reports less than the best configuration actually fitted
+        best = max(finished, key=lambda c: c['scores'].mean())
+        best_params = dict(best['params'])
+        if best['fidelity'] is not None:
+            best_params[best['fidelity']] = self._resource(best, best['rung'])
+        return best['scores'].mean(), best['scores'].std(), best['name'], best_params
+
+    def _prepare_folds(self):
+        folds = []
+        splitter = check_cv(self.cv, self.y, classifier=self.task_type == 'classification')
+        for train_idx, test_idx in splitter.split(self.X, self.y):
+            prep = clone(self.preprocessor)
+            X_train = prep.fit_transform(self.X.iloc[train_idx])
+            X_test = prep.transform(self.X.iloc[test_idx])
+            folds.append((X_train, self.y.iloc[train_idx], X_test, self.y.iloc[test_idx]))
+        return folds
+
+    def _resource(self, cand, rung):
+        return cand['r_min'] * self.eta ** rung
+
+    def _evaluate(self, ci, cand, rung, folds, models):
+        scores = []
+        try:
+            for fi, (X_train, y_train, X_test, y_test) in enumerate(folds):
+                model = models.get((ci, fi))
+                if model is None:
+                    model = clone(cand['estimator']).set_params(**cand['params'])
+                    models[(ci, fi)] = model
+                if cand['fidelity'] == 'max_iter':
+                    # A warm-started MLP trains max_iter *more* epochs on each fit call
+                    previous = self._resource(cand, rung - 1) if rung > 0 else 0
+                    model.set_params(max_iter=self._resource(cand, rung) - previous)
+                elif cand['fidelity'] is not None:
+                    model.set_params(**{cand['fidelity']: self._resource(cand, rung)})
+                with warnings.catch_warnings():
+                    if cand['fidelity'] is not None:
+                        # Early rungs stop MLPs short on purpose; only a promotion tells whether more epochs help
+                        warnings.simplefilter('ignore', ConvergenceWarning)
+                    model.fit(X_train, y_train)
+                scores.append(model.score(X_test, y_test))
+        except Exception as e:
+            cand['error'] = e
+            return
+        cand['rung'] = rung
+        cand['scores'] = np.array(scores)
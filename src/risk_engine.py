@@ -1,8 +1,10 @@
 class RiskEngine:
-    def __init__(self, data_stats: dict, context_data: dict, ml_accuracy_std: float):
+    def __init__(self, data_stats: dict, context_data: dict, ml_accuracy_std: float, profile=None):
         self.stats = data_stats
         self.context = context_data
         self.ml_std = ml_accuracy_std
+        # Optional DatasetProfile: sample count and missingness are read straight from it
+        self.profile = profile
 
     def calculate_risk(self):
         """
@@ -13,9 +15,14 @@ class RiskEngine:
         # - Low sample count
         # - High signal-to-noise (wait, high signal is low risk. Low signal is high risk)
         
+        if self.profile is not None:
+            n_samples, missing_ratio = self.profile.n_rows, self.profile.missing_ratio()
+        else:
+            n_samples, missing_ratio = self.stats.get('n_samples', 0), self.stats.get('missing_ratio', 0)
+
         r_data = 0.0
-        if self.stats.get('n_samples', 0) < 500: r_data += 0.4
-        if self.stats.get('missing_ratio', 0) > 0.2: r_data += 0.3
+        if n_samples < 500: r_data += 0.4
+        if missing_ratio > 0.2: r_data += 0.3
         if self.stats.get('signal_to_noise_est', 1) < 0.6: r_data += 0.3
         
         # 2. Model Risk